@@ -3,11 +3,45 @@ import plotly.graph_objects as go
 from streamlit_extras.colored_header import colored_header
 import io
 from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+import html
 import csv
 
+# Custom CSS for the sidebar styling, defined once at import time
+CSS_BLOCK = """
+<style>
+.big-font {
+    font-size:24px !important;
+    font-weight: bold;
+    color: #4682B4; 
+}
+.about-section {
+    background-color: #F5F5F5;  
+    padding: 10px;
+    border-radius: 5px;
+    margin-bottom: 10px;
+    border: 1px solid #E0E0E0;  
+}
+.about-section h1 {
+    color: #4682B4;  
+    font-size: 20px;
+}
+.creator-info {
+    font-style: italic;
+    color: #708090;  
+}
+</style>
+"""
+
+# Bounds for the st.cache_data caches, which are shared by every session on the server
+CACHE_MAX_ENTRIES = 32
+CACHE_TTL_SECONDS = 3600
+
 # Define a class to represent a subfactor within a scoring factor
 class SubFactor:
+    __slots__ = ('name', 'score', 'comment')
+
     def __init__(self, name, score=3, comment=""):
         self.name = name
         self.score = score
@@ -15,23 +49,27 @@ class SubFactor:
 
 # Define a class to represent a scoring factor with subfactors
 class ScoringFactor:
+    # Fixed attribute layout keeps attribute access cheap in the summary calculations
+    __slots__ = ('name', 'weight', 'subfactors', '_index')
+
     def __init__(self, name, subfactors, weight=1):
         self.name = name
         self.weight = weight
-        # Create subfactors using dictionary comprehension
-        self.subfactors = {sf: SubFactor(sf) for sf in subfactors}
+        # Store subfactors in order, with a name-to-position index for updates
+        self.subfactors = tuple(SubFactor(sf) for sf in subfactors)
+        self._index = {sf.name: i for i, sf in enumerate(self.subfactors)}
 
     # Update the score of a specific subfactor
     def update_score(self, subfactor, score):
-        self.subfactors[subfactor].score = score
+        self.subfactors[self._index[subfactor]].score = score
 
     # Update the comment of a specific subfactor
     def update_comment(self, subfactor, comment):
-        self.subfactors[subfactor].comment = comment
+        self.subfactors[self._index[subfactor]].comment = comment
 
     # Calculate the average score of all subfactors
     def get_average_score(self):
-        return sum(sf.score for sf in self.subfactors.values()) / len(self.subfactors)
+        return sum(sf.score for sf in self.subfactors) / len(self.subfactors)
 
     # Calculate the weighted score of the factor
     def get_weighted_score(self):
@@ -81,6 +119,106 @@ class InvestmentScorecard:
     def get_max_possible_score(self):
         return 5 
 
+# Build the radar chart figure for the factor scores and weights
+def _build_radar(categories, scores, weights):
+    fig = go.Figure(data=go.Scatterpolar(
+        r=scores,
+        theta=categories,
+        fill='toself',
+        name='Scores'
+    ))
+
+    fig.add_trace(go.Scatterpolar(
+        r=[w * 5 for w in weights], 
+        theta=categories,
+        fill='toself',
+        name='Weights'
+    ))
+
+    fig.update_layout(
+        polar=dict(
+            radialaxis=dict(visible=True, range=[0, 5])
+        ),
+        showlegend=True,
+        height=400,
+        margin=dict(l=50, r=50, t=50, b=50)
+    )
+    return fig
+
+# Generate a PDF report of the scorecard, built at most once per scorecard state
+# (underscore-prefixed arguments are derived from the snapshot and are not hashed)
+@st.cache_data(show_spinner=False, max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS)
+def _cached_pdf(snapshot, max_score, _averages, _total_score):
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter, leftMargin=50, rightMargin=50, topMargin=50, bottomMargin=50)
+
+    # Paragraph styles for headings, subfactor lines and indented comments
+    styles = getSampleStyleSheet()
+    heading_style = styles['Heading2']
+    body_style = styles['BodyText']
+    subfactor_style = ParagraphStyle('Subfactor', parent=body_style, leftIndent=20)
+    comment_style = ParagraphStyle('Comment', parent=body_style, leftIndent=40)
+
+    # PDF content generation (title, factors, scores, comments, summary)
+    story = [Paragraph("Investment Scorecard Report", styles['Title'])]
+
+    for (factor_name, weight, subfactors), average in zip(snapshot, _averages):
+        story.append(Paragraph(html.escape(factor_name), heading_style))
+        for subfactor_name, score, comment in subfactors:
+            story.append(Paragraph(f"<b>{html.escape(subfactor_name)}</b>: Score {score}", subfactor_style))
+            story.append(Paragraph(f"Comment: {html.escape(comment)}", comment_style))
+            story.append(Spacer(1, 8))
+        story.append(Paragraph(f"Average Score: {average:.2f}, Weight: {weight:.2f}", body_style))
+        story.append(Spacer(1, 12))
+
+    percentage = (_total_score / max_score) * 100
+    
+    story.append(Paragraph("Summary", heading_style))
+    story.append(Paragraph(f"Total Score: {_total_score:.2f} / {max_score:.2f}", body_style))
+    story.append(Paragraph(f"Percentage of Max Score: {percentage:.2f}%", body_style))
+
+    # Line wrapping and page breaks are handled by the document template
+    doc.build(story)
+    return buffer.getvalue()
+
+# Generate CSV data of the scorecard, built at most once per scorecard state
+# (the underscore-prefixed total is derived from the snapshot and is not hashed)
+@st.cache_data(show_spinner=False, max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS)
+def _cached_csv(snapshot, max_score, _total_score):
+    # Encode straight into a byte buffer so the download needs no extra string copy
+    buffer = io.BytesIO()
+    output = io.TextIOWrapper(buffer, encoding="utf-8", newline="", write_through=True)
+    writer = csv.writer(output)
+    
+    percentage = (_total_score / max_score) * 100
+
+    # Build all rows up front and write them in a single batch
+    rows = [["Factor", "Subfactor", "Score", "Comment", "Weight"]]
+    rows.extend(
+        [factor_name, subfactor_name, score, comment, weight]
+        for factor_name, weight, subfactors in snapshot
+        for subfactor_name, score, comment in subfactors
+    )
+    rows.append([])
+    rows.extend([
+        ["Total Score", _total_score],
+        ["Max Possible Score", max_score],
+        ["Percentage of Max Score", f"{percentage:.2f}%"]
+    ])
+    writer.writerows(rows)
+    
+    output.flush()
+    output.detach()
+    return buffer.getvalue()
+
+# Write an edited score back to the scorecard (widget on_change callback)
+def _on_score(i, j, factor, subfactor_name):
+    factor.update_score(subfactor_name, st.session_state[f"select_{i}_{j}"])
+
+# Write an edited comment back to the scorecard (widget on_change callback)
+def _on_comment(i, j, factor, subfactor_name):
+    factor.update_comment(subfactor_name, st.session_state[f"comment_{i}_{j}"])
+
 # Define the main Streamlit application class
 class InvestmentScorecardApp:
     def __init__(self):
@@ -101,6 +239,8 @@ class InvestmentScorecardApp:
             4: ("Good", "😊"),
             5: ("Excellent", "🌟")
         }
+        # Precompute the score option labels shown in the selectboxes
+        self._score_labels = {k: f"{k} - {v[0]} {v[1]}" for k, v in self.score_descriptions.items()}
         # Define descriptions for each subfactor
         self.subfactor_descriptions = {
             "Ability": "Team's capability to execute the business plan",
@@ -117,6 +257,10 @@ class InvestmentScorecardApp:
     # Run the Streamlit application
     def run(self):
         st.set_page_config(layout="wide", page_title="Investment Scorecard")
+
+        # Compute factor averages and the total score once for the summary, chart and exports
+        self._avgs = [factor.get_average_score() for factor in self.scorecard.factors]
+        self._total = sum(avg * factor.weight for avg, factor in zip(self._avgs, self.scorecard.factors))
         
         # Display sidebar content
         self._display_sidebar()
@@ -139,30 +283,7 @@ class InvestmentScorecardApp:
     def _display_sidebar(self):
         with st.sidebar:
             # Custom CSS for styling
-            st.markdown("""
-            <style>
-            .big-font {
-                font-size:24px !important;
-                font-weight: bold;
-                color: #4682B4; 
-            }
-            .about-section {
-                background-color: #F5F5F5;  
-                padding: 10px;
-                border-radius: 5px;
-                margin-bottom: 10px;
-                border: 1px solid #E0E0E0;  
-            }
-            .about-section h1 {
-                color: #4682B4;  
-                font-size: 20px;
-            }
-            .creator-info {
-                font-style: italic;
-                color: #708090;  
-            }
-            </style>
-            """, unsafe_allow_html=True)
+            st.markdown(CSS_BLOCK, unsafe_allow_html=True)
 
             st.markdown('<p class="big-font">Investment Scorecard</p>', unsafe_allow_html=True)
             
@@ -198,39 +319,42 @@ class InvestmentScorecardApp:
             st.subheader(f"{factor.name}")
             
             with st.expander(f"Evaluate {factor.name} Sub-factors", expanded=True):
-                for j, (subfactor_name, subfactor) in enumerate(factor.subfactors.items()):
+                for j, subfactor in enumerate(factor.subfactors):
+                    subfactor_name = subfactor.name
                     col1, col2 = st.columns([1, 2])
                     with col1:
                         # Display score selection for each subfactor
-                        score = st.selectbox(
+                        st.selectbox(
                             f"{subfactor_name}",
                             options=[1, 2, 3, 4, 5],
-                            format_func=lambda x: f"{x} - {self.score_descriptions[x][0]} {self.score_descriptions[x][1]}",
+                            format_func=self._score_labels.get,
                             index=subfactor.score - 1,
-                            key=f"select_{i}_{j}"
+                            key=f"select_{i}_{j}",
+                            on_change=_on_score,
+                            args=(i, j, factor, subfactor_name)
                         )
-                        factor.update_score(subfactor_name, score)
                     with col2:
                         # Display comment area for each subfactor
-                        comment = st.text_area(
+                        st.text_area(
                             f"Comment on {subfactor_name}",
                             value=subfactor.comment,
                             max_chars=280,
                             height=200,
                             key=f"comment_{i}_{j}",
-                            placeholder=self.subfactor_descriptions[subfactor_name]
+                            placeholder=self.subfactor_descriptions[subfactor_name],
+                            on_change=_on_comment,
+                            args=(i, j, factor, subfactor_name)
                         )
-                        factor.update_comment(subfactor_name, comment)
                     st.markdown("---")
             
-            st.write(f"Average Score: {factor.get_average_score():.2f}")
+            st.write(f"Average Score: {self._avgs[i]:.2f}")
             st.write(f"Weight: {factor.weight:.2f}")
             st.markdown("---")
 
     # Display the overall score summary
     def _display_summary(self):
         colored_header("Score Summary", description="Overall investment score")
-        total_score = self.scorecard.get_total_score()
+        total_score = self._total
         max_score = self.scorecard.get_max_possible_score()
         percentage = (total_score / max_score) * 100
 
@@ -293,41 +417,19 @@ class InvestmentScorecardApp:
         colored_header("Score Visualization", description="Radar chart of factor scores")
         
         categories = [factor.name for factor in self.scorecard.factors]
-        scores = [factor.get_average_score() for factor in self.scorecard.factors]
         weights = [factor.weight for factor in self.scorecard.factors]
 
-        # Create the radar chart using Plotly
-        fig = go.Figure(data=go.Scatterpolar(
-            r=scores,
-            theta=categories,
-            fill='toself',
-            name='Scores'
-        ))
-
-        fig.add_trace(go.Scatterpolar(
-            r=[w * 5 for w in weights], 
-            theta=categories,
-            fill='toself',
-            name='Weights'
-        ))
-
-        fig.update_layout(
-            polar=dict(
-                radialaxis=dict(visible=True, range=[0, 5])
-            ),
-            showlegend=True,
-            height=400,
-            margin=dict(l=50, r=50, t=50, b=50)
-        )
-
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(_build_radar(categories, self._avgs, weights), use_container_width=True)
 
     # Display export options for downloading PDF and CSV
     def _display_export_options(self):
         st.sidebar.header("Export Options")
         st.sidebar.write("Download your scorecard")
-        
-        pdf = self._generate_pdf()
+
+        snapshot = self._scorecard_snapshot()
+        max_score = self.scorecard.get_max_possible_score()
+
+        pdf = _cached_pdf(snapshot, max_score, self._avgs, self._total)
         # Download button for PDF report
         st.sidebar.download_button(
             label="Download PDF",
@@ -336,95 +438,24 @@ class InvestmentScorecardApp:
             mime="application/pdf"
         )
 
-        csv = self._generate_csv()
+        csv_data = _cached_csv(snapshot, max_score, self._total)
         # Download button for CSV data
         st.sidebar.download_button(
             label="Download CSV",
-            data=csv,
+            data=csv_data,
             file_name="investment_scorecard.csv",
             mime="text/csv"
         )
 
-    # Generate a PDF report of the scorecard
-    def _generate_pdf(self):
-        buffer = io.BytesIO()
-        c = canvas.Canvas(buffer, pagesize=letter)
-        width, height = letter
-
-        # Helper function to draw wrapped text
-        def draw_wrapped_text(text, x, y, width, font_name, font_size):
-            c.setFont(font_name, font_size)
-            words = text.split()
-            lines = []
-            current_line = []
-            for word in words:
-                if c.stringWidth(' '.join(current_line + [word])) < width:
-                    current_line.append(word)
-                else:
-                    lines.append(' '.join(current_line))
-                    current_line = [word]
-            lines.append(' '.join(current_line))
-            
-            for line in lines:
-                c.drawString(x, y, line)
-                y -= font_size + 2
-            return y
-
-        # PDF content generation (title, factors, scores, comments, summary)
-        y = height - 50
-        y = draw_wrapped_text("Investment Scorecard Report", 50, y, width - 100, "Helvetica-Bold", 16)
-        y -= 20
-
-        for factor in self.scorecard.factors:
-            y = draw_wrapped_text(f"{factor.name}", 50, y, width - 100, "Helvetica-Bold", 14)
-            y -= 10
-            for subfactor_name, subfactor in factor.subfactors.items():
-                y = draw_wrapped_text(f"{subfactor_name}: Score {subfactor.score}", 70, y, width - 140, "Helvetica", 12)
-                y -= 5
-                y = draw_wrapped_text(f"Comment: {subfactor.comment}", 90, y, width - 180, "Helvetica", 12)
-                y -= 10
-            y = draw_wrapped_text(f"Average Score: {factor.get_average_score():.2f}, Weight: {factor.weight:.2f}", 50, y, width - 100, "Helvetica", 12)
-            y -= 20
-            
-            # Start a new page if content exceeds current page
-            if y < 50: 
-                c.showPage()
-                y = height - 50
-
-        total_score = self.scorecard.get_total_score()
-        max_score = self.scorecard.get_max_possible_score()
-        percentage = (total_score / max_score) * 100
-        
-        y = draw_wrapped_text("Summary", 50, y, width - 100, "Helvetica-Bold", 14)
-        y -= 10
-        y = draw_wrapped_text(f"Total Score: {total_score:.2f} / {max_score:.2f}", 50, y, width - 100, "Helvetica", 12)
-        y -= 5
-        y = draw_wrapped_text(f"Percentage of Max Score: {percentage:.2f}%", 50, y, width - 100, "Helvetica", 12)
-
-        c.save()
-        buffer.seek(0)
-        return buffer
-
-    # Generate CSV data of the scorecard
-    def _generate_csv(self):
-        output = io.StringIO()
-        writer = csv.writer(output)
-        
-        writer.writerow(["Factor", "Subfactor", "Score", "Comment", "Weight"])
-        for factor in self.scorecard.factors:
-            for subfactor_name, subfactor in factor.subfactors.items():
-                writer.writerow([factor.name, subfactor_name, subfactor.score, subfactor.comment, factor.weight])
-        
-        total_score = self.scorecard.get_total_score()
-        max_score = self.scorecard.get_max_possible_score()
-        percentage = (total_score / max_score) * 100
-        
-        writer.writerow([])
-        writer.writerow(["Total Score", total_score])
-        writer.writerow(["Max Possible Score", max_score])
-        writer.writerow(["Percentage of Max Score", f"{percentage:.2f}%"])
-        
-        return output.getvalue()
+    # Capture the scorecard state as a hashable tuple for keying cached exports
+    def _scorecard_snapshot(self):
+        return tuple(
+            (factor.name, factor.weight, tuple(
+                (subfactor.name, subfactor.score, subfactor.comment)
+                for subfactor in factor.subfactors
+            ))
+            for factor in self.scorecard.factors
+        )
 
 # Entry point for running the Streamlit application
 if __name__ == "__main__":